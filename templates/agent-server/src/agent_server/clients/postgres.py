@@ -46,6 +46,15 @@ class PostgresPoolConf:
 
     min_size: int = 1
     max_size: int = 10
+    max_overflow: int = 5  # Extra SQLAlchemy connections allowed under load
+    timeout: float = 30.0  # Seconds to wait for a free connection
+    recycle: float = 3600.0  # Seconds before a connection is replaced
+    pre_ping: bool = True  # Check connections before handing them out
+
+    @property
+    def max_connections(self) -> int:
+        """Most connections the psycopg pool and SQLAlchemy engine can open."""
+        return self.max_size + self.max_size + self.max_overflow
 
 
 class PostgresClient:
@@ -69,6 +78,7 @@ class PostgresClient:
         self._engine = None
         self._initialized = False
         self._connected = False
+        self._connected_event = asyncio.Event()
         self._connection_task = None
         self._monitor_task = None
         self._last_connection_error = None
@@ -80,7 +90,14 @@ class PostgresClient:
             raise ValueError("PostgresConf required")
 
         # Create SQLAlchemy engine for SQLModel
-        self._engine = create_async_engine(self._config.get_sqlalchemy_url())
+        self._engine = create_async_engine(
+            self._config.get_sqlalchemy_url(),
+            pool_size=self._pool_config.max_size,
+            max_overflow=self._pool_config.max_overflow,
+            pool_timeout=self._pool_config.timeout,
+            pool_recycle=self._pool_config.recycle,
+            pool_pre_ping=self._pool_config.pre_ping,
+        )
 
         self._initialized = True
         logger.info("PostgreSQL client initialized")
@@ -107,7 +124,10 @@ class PostgresClient:
                         if result and result[0] == 1:
                             logger.info("PostgreSQL connection test successful")
 
+                await self._warm_engine_pool()
+
                 self._connected = True
+                self._connected_event.set()
                 logger.info("PostgreSQL connection established successfully")
 
                 # Start background health monitor
@@ -131,14 +151,26 @@ class PostgresClient:
             conninfo=self._config.get_connection_string(),
             min_size=self._pool_config.min_size,
             max_size=self._pool_config.max_size,
-            timeout=30.0,
-            max_lifetime=3600.0,
+            timeout=self._pool_config.timeout,
+            max_lifetime=self._pool_config.recycle,
             max_idle=600.0,
             open=False,  # Don't open in constructor to avoid deprecation warning
         )
         await pool.open()  # Open explicitly
         return pool
 
+    async def _warm_engine_pool(self):
+        """Open min_size engine connections up front so early queries skip the handshake"""
+        connections = await asyncio.gather(
+            *(self._engine.connect() for _ in range(self._pool_config.min_size)),
+            return_exceptions=True,
+        )
+        for conn in connections:
+            if isinstance(conn, Exception):
+                logger.warning(f"Failed to pre-warm PostgreSQL connection: {conn}")
+            else:
+                await conn.close()  # Returns the connection to the engine pool
+
     async def create_tables(self, metadata):
         """Create database tables using provided SQLModel metadata
 
@@ -188,12 +220,14 @@ class PostgresClient:
             except Exception as e:
                 logger.error(f"Database connection lost: {e}")
                 self._connected = False
+                self._connected_event.clear()
                 logger.info("Attempting to reconnect...")
                 try:
                     if self._pool:
                         await self._pool.close()
                     self._pool = await self._create_pool()
                     self._connected = True
+                    self._connected_event.set()
                     logger.info("Successfully reconnected to database")
                 except Exception as reconnect_error:
                     logger.error(f"Failed to reconnect: {reconnect_error}")
@@ -207,8 +241,8 @@ class PostgresClient:
     async def _ensure_connected(self):
         """Ensure client is connected (blocks until connected)"""
         self._ensure_initialized()
-        while not self._connected:
-            await asyncio.sleep(0.1)  # Wait for connection
+        if not self._connected:
+            await self._connected_event.wait()
 
     async def close(self):
         """Close the PostgreSQL client"""
@@ -232,6 +266,7 @@ class PostgresClient:
             await self._pool.close()
             self._pool = None
             self._connected = False
+            self._connected_event.clear()
             self._initialized = False
             logger.info("PostgreSQL client closed")
 
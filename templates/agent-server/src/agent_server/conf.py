@@ -32,6 +32,9 @@ HTTP_AUTORELOAD = EnvVarSpec(
     type=(bool, ...),
 )
 
+## Agents ##
+AGENT_WORKERS = EnvVarSpec(id="AGENT_WORKERS", parse=int, default="16", type=(int, ...))
+
 ## Opper API ##
 OPPER_API_KEY = EnvVarSpec(
     id="OPPER_API_KEY",
@@ -62,6 +65,34 @@ POSTGRES_POOL_MAX = EnvVarSpec(
     id="POSTGRES_POOL_MAX", parse=int, default="10", type=(int, ...)
 )
 
+POSTGRES_POOL_MAX_OVERFLOW = EnvVarSpec(
+    id="POSTGRES_POOL_MAX_OVERFLOW", parse=int, default="5", type=(int, ...)
+)
+
+POSTGRES_POOL_TIMEOUT = EnvVarSpec(
+    id="POSTGRES_POOL_TIMEOUT", parse=float, default="30", type=(float, ...)
+)
+
+POSTGRES_POOL_RECYCLE = EnvVarSpec(
+    id="POSTGRES_POOL_RECYCLE", parse=float, default="3600", type=(float, ...)
+)
+
+POSTGRES_POOL_PRE_PING = EnvVarSpec(
+    id="POSTGRES_POOL_PRE_PING",
+    parse=lambda x: x.lower() == "true",
+    default="true",
+    type=(bool, ...),
+)
+
+# Connection budget for this server process; startup fails if the pools
+# could open more connections than this. Unset means no limit.
+POSTGRES_MAX_CONNECTIONS = EnvVarSpec(
+    id="POSTGRES_MAX_CONNECTIONS",
+    parse=int,
+    is_optional=True,
+    type=(int | None, None),
+)
+
 #### Validation ####
 
 
@@ -72,6 +103,7 @@ def validate() -> bool:
         HTTP_HOST,
         HTTP_PORT,
         HTTP_AUTORELOAD,
+        AGENT_WORKERS,
         OPPER_API_KEY,
     ]
 
@@ -86,6 +118,11 @@ def validate() -> bool:
                 POSTGRES_PORT,
                 POSTGRES_POOL_MIN,
                 POSTGRES_POOL_MAX,
+                POSTGRES_POOL_MAX_OVERFLOW,
+                POSTGRES_POOL_TIMEOUT,
+                POSTGRES_POOL_RECYCLE,
+                POSTGRES_POOL_PRE_PING,
+                POSTGRES_MAX_CONNECTIONS,
             ]
         )
 
@@ -114,6 +151,11 @@ def get_http_conf() -> HttpServerConf:
     )
 
 
+def get_agent_workers() -> int:
+    """Get the number of threads running agent calls."""
+    return env.parse(AGENT_WORKERS)
+
+
 def get_opper_api_key() -> str:
     """Get Opper API key."""
     return env.parse(OPPER_API_KEY)
@@ -141,4 +183,13 @@ def get_postgres_pool_conf():
     return PostgresPoolConf(
         min_size=env.parse(POSTGRES_POOL_MIN),
         max_size=env.parse(POSTGRES_POOL_MAX),
+        max_overflow=env.parse(POSTGRES_POOL_MAX_OVERFLOW),
+        timeout=env.parse(POSTGRES_POOL_TIMEOUT),
+        recycle=env.parse(POSTGRES_POOL_RECYCLE),
+        pre_ping=env.parse(POSTGRES_POOL_PRE_PING),
     )
+
+
+def get_postgres_max_connections() -> int | None:
+    """Get the PostgreSQL connection budget for this process, if any."""
+    return env.parse(POSTGRES_MAX_CONNECTIONS)
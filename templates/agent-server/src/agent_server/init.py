@@ -6,18 +6,24 @@ and can be re-run for hot reloading. It's designed to be generic and
 extensible for future initialization needs.
 """
 
+import asyncio
 import warnings
 from contextlib import asynccontextmanager
+from typing import Any
 from fastapi import FastAPI
 from sqlmodel import SQLModel
 from . import conf
 from .utils import log
 from .registry import AgentRegistry
 from .agents import AGENT_DEFINITIONS
+from .models.agent_definition import AgentDefinition
 from .utils.agent_utils import cleanup_all_background_tasks
 
 logger = log.get_logger(__name__)
 
+# Maximum number of agent factories run concurrently on startup
+AGENT_INIT_CONCURRENCY = 8
+
 
 async def init() -> None:
     """
@@ -58,6 +64,18 @@ async def init_database(app: FastAPI) -> None:
 
         postgres_config = conf.get_postgres_conf()
         pool_config = conf.get_postgres_pool_conf()
+        logger.info(f"PostgreSQL pool configuration: {pool_config}")
+
+        max_connections = conf.get_postgres_max_connections()
+        if (
+            max_connections is not None
+            and pool_config.max_connections > max_connections
+        ):
+            raise ValueError(
+                f"PostgreSQL pools may open {pool_config.max_connections} "
+                f"connections, more than POSTGRES_MAX_CONNECTIONS={max_connections}"
+            )
+
         app.state.postgres_client = PostgresClient(postgres_config, pool_config)
         await app.state.postgres_client.initialize()
         await app.state.postgres_client.init_connection()
@@ -80,15 +98,51 @@ async def init_database(app: FastAPI) -> None:
     )
 
 
-async def init_agents(app: FastAPI) -> None:
+async def create_agents() -> list[tuple[str, Any]]:
     """
-    Initialize and register all configured agents.
+    Create agent instances for all configured agent definitions.
+
+    Factories run concurrently in worker threads (at most
+    AGENT_INIT_CONCURRENCY at a time) so that any I/O they do (loading
+    models, fetching tool schemas) doesn't block the event loop or add
+    up across agents.
+
+    Returns:
+        List of (agent name, agent instance) pairs for agents that were
+        created successfully, in AGENT_DEFINITIONS order
+    """
+    semaphore = asyncio.Semaphore(AGENT_INIT_CONCURRENCY)
+
+    async def build(agent_def: AgentDefinition) -> Any | None:
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(agent_def.factory)
+            except Exception:
+                logger.exception(f"Failed to initialize agent {agent_def.name}")
+                return None
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            (agent_def.name, tg.create_task(build(agent_def)))
+            for agent_def in AGENT_DEFINITIONS
+        ]
+
+    agents = [(name, task.result()) for name, task in tasks]
+    return [(name, agent) for name, agent in agents if agent is not None]
+
+
+async def init_agents(app: FastAPI, agents: list[tuple[str, Any]]) -> None:
+    """
+    Initialize the agent registry and register the given agents.
 
     Args:
         app: FastAPI application instance
+        agents: (agent name, agent instance) pairs from create_agents()
     """
     # Initialize agent registry with call repository
-    app.state.agent_registry = AgentRegistry(app.state.call_repository)
+    app.state.agent_registry = AgentRegistry(
+        app.state.call_repository, agent_workers=conf.get_agent_workers()
+    )
 
     # Start the event worker that will process all agent events
     await app.state.agent_registry.start_event_worker()
@@ -96,14 +150,13 @@ async def init_agents(app: FastAPI) -> None:
     # Register all agents from the AGENT_DEFINITIONS list
     try:
         if AGENT_DEFINITIONS:
-            for agent_def in AGENT_DEFINITIONS:
+            for agent_name, agent in agents:
                 try:
-                    agent = agent_def.factory()
-                    app.state.agent_registry.register_agent(agent_def.name, agent)
-                except Exception as e:
-                    logger.exception(f"Failed to initialize agent {agent_def.name}")
+                    app.state.agent_registry.register_agent(agent_name, agent)
+                except Exception:
+                    logger.exception(f"Failed to register agent {agent_name}")
 
-            logger.info(f"Successfully registered {len(AGENT_DEFINITIONS)} agents")
+            logger.info(f"Successfully registered {len(agents)} agents")
         else:
             logger.info(
                 "No agents configured. Create your first agent with: bin/add-agent <name>"
@@ -149,9 +202,10 @@ async def lifespan(app: FastAPI):
     # Run generic initialization
     await init()
 
-    # Initialize components
-    await init_database(app)
-    await init_agents(app)
+    # Initialize components. Agent construction doesn't depend on the
+    # database, so it runs while the database is being set up.
+    _, agents = await asyncio.gather(init_database(app), create_agents())
+    await init_agents(app, agents)
 
     logger.info("Agent Server ready")
 
@@ -9,6 +9,7 @@ and routes are organized in the routes/ directory.
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from . import conf
 from .init import lifespan
 from .routes import register_routes
@@ -29,6 +30,7 @@ def create_app() -> FastAPI:
         description="AI agents powered by Opper SDK with call-based execution",
         version="1.0.0",
         docs_url="/docs",
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
 
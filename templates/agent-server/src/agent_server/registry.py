@@ -2,41 +2,145 @@
 Agent registry for managing and tracking agent instances.
 """
 
+import ast
 import asyncio
+import copy
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from typing import Any
 from uuid import UUID
 from .utils import log
-from .models.calls import CallThought, CallAction, CallResult, CallError, CallStatus
+from .models.calls import CallThought, CallAction, CallResult, CallError
 from .repositories.calls import CallRepository
+from .utils.agent_utils import get_agent_schema, spawn_agent_task
 
 logger = log.get_logger(__name__)
 
+# (agent_name, call_id) of the agent call running in the current context
+_call_context: ContextVar[tuple[str, UUID]] = ContextVar("agent_call_context")
+
+# Maximum number of agent events waiting for the event worker
+EVENT_QUEUE_SIZE = 10_000
+
+# Seconds an agent thread waits for room in a full event queue before the
+# event is dropped
+EVENT_QUEUE_PUT_TIMEOUT = 30.0
+
+# Maximum number of queued events the event worker takes in one batch
+EVENT_BATCH_SIZE = 100
+
+# Number of recently cancelled calls remembered for dropping their late events
+CANCELLED_CALLS_SIZE = 1000
+
+
+def _parse_dict_string(text: str) -> Any:
+    """
+    Parse a stringified dict from a tool result.
+
+    Tool results are usually JSON, which json.loads handles much faster than
+    ast.literal_eval; the latter is only used for Python reprs (single
+    quotes, True/None). Returns None if the text can't be parsed.
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def _configured(agent: Any, **overrides: Any) -> Any:
+    """
+    Get the agent to run a call with, applying per-call settings.
+
+    Registered agents are shared by all calls, so settings are applied to a
+    shallow copy rather than the agent itself. Without overrides the agent
+    is returned as is.
+    """
+    if not overrides:
+        return agent
+    configured = copy.copy(agent)
+    for name, value in overrides.items():
+        setattr(configured, name, value)
+    return configured
+
 
 class AgentRegistry:
     """Registry for tracking and managing agents."""
 
-    def __init__(self, call_repository: CallRepository):
+    def __init__(
+        self,
+        call_repository: CallRepository,
+        agent_workers: int,
+        event_queue_size: int = EVENT_QUEUE_SIZE,
+    ):
         self.agents: dict[str, Any] = {}
+        self._agent_metadata: dict[str, dict[str, Any]] = {}  # name -> metadata
         self.call_repository = call_repository
         self._call_agents: dict[UUID, str] = {}  # call_id -> agent_name mapping
         self._running_tasks: dict[
             UUID, asyncio.Task
         ] = {}  # call_id -> asyncio.Task mapping for cancellation
-        self._event_queue: asyncio.Queue = (
-            asyncio.Queue()
-        )  # Queue for events from Opper SDK
+        self._events: deque[tuple[str, UUID, Any]] = deque()  # Events from Opper SDK
+        self._events_ready = asyncio.Event()  # Set when events are pending
+        self._event_slots = threading.BoundedSemaphore(
+            event_queue_size
+        )  # Bounds the number of pending events
+        self._cancelled_calls: dict[UUID, None] = {}  # Recently cancelled call_ids
         self._worker_task: asyncio.Task | None = None  # Event worker task
+        self._loop: asyncio.AbstractEventLoop | None = None  # Loop running the worker
+        self._agent_executor = ThreadPoolExecutor(
+            max_workers=agent_workers, thread_name_prefix="agent"
+        )  # Threads running agent calls
+        self._thread_state = threading.local()  # Per-thread event loop
+        self._thread_loops: list[asyncio.AbstractEventLoop] = []  # For cleanup
+        self._thread_loops_lock = threading.Lock()
+        self._event_builders = {
+            "thought_created": self._build_thought,
+            "action_executed": self._build_action,
+        }  # event_type -> builder for events appended in batches
+        self._event_handlers = {
+            "goal_completed": self._handle_goal_completed,
+            "goal_start": self._handle_goal_start,
+            "error": self._handle_error_event,
+        }  # event_type -> handler
 
     def register_agent(self, name: str, agent: Any):
         """Register an agent in the registry."""
+        # Build the metadata first so a failure leaves nothing registered
+        metadata = self._build_agent_metadata(name, agent)
+        agent.callback = self._handle_agent_event
         self.agents[name] = agent
+        self._agent_metadata[name] = metadata
         logger.info(f"Registered agent: {name}")
 
-    async def _handle_thought_created(
-        self, call_id: UUID, data: dict[str, Any]
-    ) -> None:
+    @staticmethod
+    def _build_agent_metadata(name: str, agent: Any) -> dict[str, Any]:
         """
-        Handle thought_created event from Opper SDK.
+        Build the metadata served for an agent.
+
+        Agents don't change after registration, so this is computed once in
+        register_agent rather than on every listing request.
+        """
+        schema_info = get_agent_schema(agent)
+        return {
+            "name": getattr(agent, "name", name),
+            "description": getattr(agent, "description", ""),
+            "max_iterations": getattr(agent, "max_iterations", 10),
+            "verbose": getattr(agent, "verbose", False),
+            "tools": [tool.name for tool in getattr(agent, "tools", [])],
+            "input_schema": schema_info["input_schema"],
+            "output_schema": schema_info["output_schema"],
+        }
+
+    def _build_thought(self, call_id: UUID, data: dict[str, Any]) -> CallThought:
+        """
+        Build a thought from a thought_created event from Opper SDK.
 
         Data structure: {"iteration": N, "thought": Thought.dict()}
         """
@@ -59,13 +163,11 @@ class AgentRegistry:
             # Store raw data
             raw_data=data,
         )
-        await self.call_repository.append_call_thought(call_id, thought)
+        return thought
 
-    async def _handle_action_executed(
-        self, call_id: UUID, data: dict[str, Any]
-    ) -> None:
+    def _build_action(self, call_id: UUID, data: dict[str, Any]) -> CallAction:
         """
-        Handle action_executed event from Opper SDK.
+        Build an action from an action_executed event from Opper SDK.
 
         Data structure: {"iteration": N, "thought": {...}, "action_result": {...}}
         """
@@ -79,20 +181,15 @@ class AgentRegistry:
 
         # Parse stringified Python dicts if needed
         if isinstance(result, str) and result.strip().startswith("{"):
-            try:
-                import ast
-
-                parsed_result = ast.literal_eval(result)
-                if isinstance(parsed_result, dict):
-                    result = parsed_result
-                    # Extract success/error info from the parsed dict
-                    if "success" in result:
-                        success = result["success"]
-                    if "error" in result and not error_message:
-                        error_message = result["error"]
-            except (ValueError, SyntaxError):
-                # Keep original string if parsing fails
-                pass
+            parsed_result = _parse_dict_string(result)
+            # Keep original string if parsing fails
+            if isinstance(parsed_result, dict):
+                result = parsed_result
+                # Extract success/error info from the parsed dict
+                if "success" in result:
+                    success = result["success"]
+                if "error" in result and not error_message:
+                    error_message = result["error"]
 
         action = CallAction(
             call_id=call_id,
@@ -106,7 +203,7 @@ class AgentRegistry:
             # Store raw data
             raw_data=data,
         )
-        await self.call_repository.append_call_action(call_id, action)
+        return action
 
     async def _handle_goal_completed(self, call_id: UUID, data: dict[str, Any]) -> None:
         """
@@ -118,11 +215,14 @@ class AgentRegistry:
         final_result = data.get("final_result")
 
         # Build metadata
-        metadata = {}
-        if iterations is not None:
-            metadata["iterations"] = iterations
-        if data.get("goal"):
-            metadata["goal"] = data["goal"]
+        metadata = {
+            key: value
+            for key, value in (
+                ("iterations", iterations),
+                ("goal", data.get("goal") or None),
+            )
+            if value is not None
+        }
 
         # Try to extract structured fields if final_result is a dict
         executive_summary = None
@@ -145,6 +245,10 @@ class AgentRegistry:
         )
         await self.call_repository.register_call_done(call_id, result)
 
+    async def _handle_goal_start(self, call_id: UUID, data: Any) -> None:
+        """Handle goal_start event from Opper SDK. Just logged, no action needed."""
+        logger.debug("Goal started for call %s", call_id)
+
     async def _handle_error_event(self, call_id: UUID, data: Any) -> None:
         """
         Handle error events.
@@ -158,8 +262,8 @@ class AgentRegistry:
             error_type = "execution_error"
             error_message = str(data)
             recoverable = False
-            raw_data = {"error": str(data)}
-        
+            raw_data = {"error": error_message}
+
         error = CallError(
             call_id=call_id,
             error_type=error_type,
@@ -169,41 +273,71 @@ class AgentRegistry:
         )
         await self.call_repository.register_call_error(call_id, error)
 
-    def _create_event_handler(self, agent_name: str, call_id: UUID):
+    def _handle_agent_event(self, event_type: str, data: Any) -> None:
         """
-        Create an event handler for a specific agent execution.
+        Handle events from the Opper agent execution.
 
-        Returns a callback function that captures the call_id.
-        """
+        Shared by all agents and calls; the call an event belongs to is read
+        from the context set up in execute_agent.
 
-        def event_handler(event_type: str, data: Any):
-            """
-            Handle events from the Opper agent execution.
-
-            Event types from Opper SDK (base_agent.py):
-            - thought_created: Contains {"iteration": N, "thought": {...}}
-            - action_executed: Contains {"iteration": N, "thought": {...}, "action_result": {...}}
-            - goal_completed: Contains {"goal": str, "achieved": bool, "iterations": N, "final_result": Any}
-            - error: Error occurred during execution
-
-            TODO: Make this async when Opper SDK supports async callbacks
-            """
-            # Log only important events
-            logger.debug(
-                f"Received event '{event_type}' for call {call_id} from agent {agent_name}"
-            )
+        Event types from Opper SDK (base_agent.py):
+        - thought_created: Contains {"iteration": N, "thought": {...}}
+        - action_executed: Contains {"iteration": N, "thought": {...}, "action_result": {...}}
+        - goal_completed: Contains {"goal": str, "achieved": bool, "iterations": N, "final_result": Any}
+        - error: Error occurred during execution
 
-            try:
-                # Just put the event on the queue (non-blocking)
-                self._event_queue.put_nowait((event_type, call_id, data))
-            except asyncio.QueueFull:
-                logger.error(
-                    f"Event queue is full! Dropping event {event_type} for call {call_id}"
+        TODO: Make this async when Opper SDK supports async callbacks
+        """
+        context = _call_context.get(None)
+        if context is None:
+            logger.warning(f"Received event '{event_type}' outside of an agent call")
+            return
+        agent_name, call_id = context
+
+        # Runs for every event, so leave formatting to the logger
+        logger.debug(
+            "Received event '%s' for call %s from agent %s",
+            event_type,
+            call_id,
+            agent_name,
+        )
+
+        try:
+            if not self._enqueue_event((event_type, call_id, data)):
+                logger.warning(
+                    f"Event queue full, dropping {event_type} event for call {call_id}"
                 )
-            except Exception as e:
-                logger.error(f"Error queueing event {event_type}: {e}", exc_info=True)
+        except Exception as e:
+            logger.error(f"Error queueing event {event_type}: {e}", exc_info=True)
+
+    def _enqueue_event(self, event: tuple[str, UUID, Any]) -> bool:
+        """
+        Hand an event to the event worker, blocking while too many are pending.
+
+        The SDK calls the event handler from the agent's thread. Events are
+        appended to a deque (safe to share between threads) and the worker is
+        woken on its own loop. A slow worker throttles agents rather than
+        letting pending events grow without bound. Returns False if the event
+        was dropped because no room freed up in time.
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            # Already on the worker's loop, where blocking would deadlock
+            if not self._event_slots.acquire(blocking=False):
+                return False
+            self._events.append(event)
+            self._events_ready.set()
+            return True
 
-        return event_handler
+        if not self._event_slots.acquire(timeout=EVENT_QUEUE_PUT_TIMEOUT):
+            return False
+        self._events.append(event)
+        self._loop.call_soon_threadsafe(self._events_ready.set)
+        return True
 
     def get_agent(self, name: str) -> Any | None:
         """Get an agent by name."""
@@ -211,27 +345,11 @@ class AgentRegistry:
 
     def list_agents(self) -> dict[str, dict[str, Any]]:
         """List all registered agents with their metadata and schemas."""
-        from .utils.agent_utils import get_agent_schema
-
-        result = {}
-        for name, agent in self.agents.items():
-            schema_info = get_agent_schema(agent)
-            result[name] = {
-                "name": agent.name if hasattr(agent, "name") else name,
-                "description": agent.description
-                if hasattr(agent, "description")
-                else "",
-                "max_iterations": agent.max_iterations
-                if hasattr(agent, "max_iterations")
-                else 10,
-                "verbose": agent.verbose if hasattr(agent, "verbose") else False,
-                "tools": [tool.name for tool in agent.tools]
-                if hasattr(agent, "tools")
-                else [],
-                "input_schema": schema_info["input_schema"],
-                "output_schema": schema_info["output_schema"],
-            }
-        return result
+        return self._agent_metadata
+
+    def get_agent_info(self, name: str) -> dict[str, Any] | None:
+        """Get the metadata and schemas of a registered agent."""
+        return self._agent_metadata.get(name)
 
     async def execute_agent(
         self,
@@ -245,45 +363,39 @@ class AgentRegistry:
         if not agent:
             raise ValueError(f"Agent '{agent_name}' not found")
 
-        # Set max_iterations if provided
-        original_max = None
+        # Apply per-call settings
+        overrides = {}
         if max_iterations is not None:
-            original_max = agent.max_iterations
-            agent.max_iterations = max_iterations
+            overrides["max_iterations"] = max_iterations
             logger.debug(f"Set max_iterations to {max_iterations} for call {call_id}")
 
         # Track this call-agent association
         self._call_agents[call_id] = agent_name
 
-        # Set up event handler for this specific call
-        original_callback = getattr(agent, "callback", None)
-        event_handler = self._create_event_handler(agent_name, call_id)
-        agent.callback = event_handler
-        logger.debug(f"Set up event handler for agent {agent_name}, call {call_id}")
+        agent = _configured(agent, **overrides)
 
         try:
             # Register call as started
             await self.call_repository.register_call_started(call_id)
 
             # Run agent.process() in a thread pool to avoid blocking the main event loop
-            def run_agent_in_thread():
-                """Run the async agent.process() in a new event loop in a thread."""
+            async def run_agent_async():
+                # Tell the shared event handler which call the events belong to
+                _call_context.set((agent_name, call_id))
+                return await agent.process(input_data)
 
-                # Use asyncio.run() which creates a new event loop, runs the coroutine,
-                # and cleans up properly. This is thread-safe for parallel calls.
-                async def run_agent_async():
-                    return await agent.process(input_data)
-
-                return asyncio.run(run_agent_async())
+            def run_agent_in_thread():
+                """Run the async agent.process() on the thread's event loop."""
+                return self._thread_loop().run_until_complete(run_agent_async())
 
-            # Run in thread pool to avoid blocking the main FastAPI event loop
+            # Run in the agent thread pool to avoid blocking the main FastAPI
+            # event loop or tying up its default executor
             result = await asyncio.get_running_loop().run_in_executor(
-                None, run_agent_in_thread
+                self._agent_executor, run_agent_in_thread
             )
 
             # Check if call was cancelled
-            call = await self.call_repository.get_call(call_id)
-            if call and call.status == CallStatus.CANCELLED:
+            if call_id in self._cancelled_calls:
                 logger.info(f"Call {call_id} was cancelled during execution")
                 return None
 
@@ -292,6 +404,7 @@ class AgentRegistry:
         except asyncio.CancelledError:
             # Handle cancellation
             logger.info(f"Call {call_id} execution cancelled")
+            self._mark_cancelled(call_id)
             await self.call_repository.register_call_cancelled(call_id)
             raise
         except Exception as e:
@@ -305,21 +418,27 @@ class AgentRegistry:
             await self.call_repository.register_call_error(call_id, error)
             raise
         finally:
-            # Restore original callback
-            if original_callback:
-                agent.callback = original_callback
-            elif hasattr(agent, "callback"):
-                delattr(agent, "callback")
-
-            # Restore original max_iterations if we changed it
-            if original_max is not None:
-                agent.max_iterations = original_max
-
             # Clean up execution tracking
             self._call_agents.pop(call_id, None)
             # Remove from running tasks
             self._running_tasks.pop(call_id, None)
 
+    def _thread_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the event loop of the current agent thread, creating it on first use.
+
+        Each thread keeps one loop for all the calls it runs instead of
+        creating and tearing one down per call with asyncio.run().
+        """
+        loop = getattr(self._thread_state, "loop", None)
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self._thread_state.loop = loop
+            with self._thread_loops_lock:
+                self._thread_loops.append(loop)
+        return loop
+
     def start_agent_execution(
         self,
         agent_name: str,
@@ -332,8 +451,9 @@ class AgentRegistry:
 
         Returns the task handle for potential cancellation.
         """
-        task = asyncio.create_task(
-            self.execute_agent(agent_name, call_id, input_data, max_iterations)
+        task = spawn_agent_task(
+            self.execute_agent(agent_name, call_id, input_data, max_iterations),
+            name=f"agent-call-{call_id}",
         )
         self._running_tasks[call_id] = task
         return task
@@ -346,41 +466,87 @@ class AgentRegistry:
         """
         task = self._running_tasks.get(call_id)
         if task and not task.done():
+            self._mark_cancelled(call_id)
             task.cancel()
-            # Wait briefly for task to acknowledge cancellation
-            try:
-                await asyncio.wait_for(task, timeout=1.0)
-            except (asyncio.TimeoutError, asyncio.CancelledError):
-                pass
+            # Wait for the task to finish unwinding so the call is marked as
+            # cancelled and its state is released before we return. The agent
+            # thread itself is left to finish on its own.
+            await asyncio.wait({task})
             return True
         return False
 
-    async def _event_worker(self):
-        """Long-running worker that processes all events from the queue."""
-        logger.info("Event worker started")
-        while True:
+    def _mark_cancelled(self, call_id: UUID) -> None:
+        """
+        Remember that a call was cancelled.
+
+        The agent thread can't be interrupted and keeps emitting events after
+        cancellation; these are dropped instead of being recorded. Only the
+        most recent CANCELLED_CALLS_SIZE calls are kept.
+        """
+        self._cancelled_calls[call_id] = None
+        if len(self._cancelled_calls) > CANCELLED_CALLS_SIZE:
+            del self._cancelled_calls[next(iter(self._cancelled_calls))]
+
+    async def _process_events(self, batch: list[tuple[str, UUID, Any]]) -> None:
+        """
+        Process a batch of events based on their types.
+
+        Thoughts and actions are collected per call and appended with one
+        append_call_events per call. Any other event for a call first appends
+        that call's pending events, so each call's events stay in order.
+        """
+        pending: dict[UUID, list[CallThought | CallAction]] = {}
+        for event_type, call_id, data in batch:
             try:
-                # Wait for an event from any agent
-                event_type, call_id, data = await self._event_queue.get()
-                logger.debug(f"Event worker processing {event_type} for call {call_id}")
-
-                # Process the event based on type
-                if event_type == "thought_created":
-                    await self._handle_thought_created(call_id, data)
-                elif event_type == "action_executed":
-                    await self._handle_action_executed(call_id, data)
-                elif event_type == "goal_completed":
-                    await self._handle_goal_completed(call_id, data)
-                elif event_type == "goal_start":
-                    # Just log it, no action needed
-                    logger.debug(f"Goal started for call {call_id}")
-                elif event_type == "error":
-                    await self._handle_error_event(call_id, data)
+                if call_id in self._cancelled_calls:
+                    logger.debug(
+                        "Dropping %s event for cancelled call %s", event_type, call_id
+                    )
+                elif builder := self._event_builders.get(event_type):
+                    pending.setdefault(call_id, []).append(builder(call_id, data))
+                elif handler := self._event_handlers.get(event_type):
+                    if events := pending.pop(call_id, None):
+                        await self._append_events(call_id, events)
+                    await handler(call_id, data)
                 else:
                     logger.warning(f"Event worker: unhandled event type '{event_type}'")
+            except Exception as e:
+                logger.error(
+                    f"Error processing {event_type} for call {call_id}: {e}",
+                    exc_info=True,
+                )
+
+        for call_id, events in pending.items():
+            await self._append_events(call_id, events)
+
+    async def _append_events(
+        self, call_id: UUID, events: list[CallThought | CallAction]
+    ) -> None:
+        """Append thoughts and actions to a call, logging any failure."""
+        try:
+            await self.call_repository.append_call_events(call_id, events)
+        except Exception as e:
+            logger.error(
+                f"Error appending {len(events)} events for call {call_id}: {e}",
+                exc_info=True,
+            )
 
-                # Mark task as done
-                self._event_queue.task_done()
+    async def _event_worker(self):
+        """Long-running worker that processes all events from agents."""
+        logger.info("Event worker started")
+        while True:
+            try:
+                # Wait for events from any agent, then process everything that
+                # is pending in batches
+                await self._events_ready.wait()
+                self._events_ready.clear()
+                while self._events:
+                    batch = []
+                    while self._events and len(batch) < EVENT_BATCH_SIZE:
+                        batch.append(self._events.popleft())
+                        self._event_slots.release()
+                    logger.debug("Event worker processing %d events", len(batch))
+                    await self._process_events(batch)
 
             except asyncio.CancelledError:
                 logger.info("Event worker shutting down")
@@ -392,6 +558,7 @@ class AgentRegistry:
     async def start_event_worker(self):
         """Start the event worker task."""
         if self._worker_task is None or self._worker_task.done():
+            self._loop = asyncio.get_running_loop()
             self._worker_task = asyncio.create_task(self._event_worker())
             logger.info("Started event worker task")
 
@@ -419,3 +586,12 @@ class AgentRegistry:
         if self._running_tasks:
             await asyncio.gather(*self._running_tasks.values(), return_exceptions=True)
         self._running_tasks.clear()
+
+        # Stop the agent threads and close their event loops. Loops of agents
+        # that are still running can't be closed and go away with the process.
+        self._agent_executor.shutdown(wait=False, cancel_futures=True)
+        with self._thread_loops_lock:
+            for loop in self._thread_loops:
+                if not loop.is_running():
+                    loop.close()
+            self._thread_loops.clear()
@@ -3,6 +3,7 @@ Repository interface and implementations for agent calls.
 """
 
 import asyncio
+import logging
 from abc import ABC, abstractmethod
 from typing import AsyncIterator
 from uuid import UUID
@@ -22,6 +23,35 @@ from ..models.calls import (
     WSError,
 )
 
+# Maximum number of undelivered events buffered per subscriber before the
+# subscriber is considered too slow and disconnected
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+def close_subscriber_queue(queue: asyncio.Queue, call_id: UUID) -> None:
+    """
+    Send the end-of-stream sentinel to a subscriber queue.
+
+    A full queue belongs to a subscriber that can't keep up. Its pending
+    events are discarded and a subscriber_overflow WSError is sent ahead of
+    the sentinel, so the client knows the stream was cut short and can
+    resubscribe to replay the call history.
+    """
+    if not queue.full():
+        queue.put_nowait(None)
+        return
+
+    while not queue.empty():
+        queue.get_nowait()
+    queue.put_nowait(
+        WSError(
+            error_type="subscriber_overflow",
+            error_message="Too many undelivered events, resubscribe to catch up",
+            call_id=call_id,
+        )
+    )
+    queue.put_nowait(None)
+
 
 class CallRepository(ABC):
     """Abstract repository for managing agent calls and events."""
@@ -51,6 +81,21 @@ class CallRepository(ABC):
         """Append an action to the call."""
         pass
 
+    async def append_call_events(
+        self, call_id: UUID, events: list[CallThought | CallAction]
+    ) -> None:
+        """
+        Append several thoughts and actions to the call, in order.
+
+        Override to write them in one round trip; by default they are
+        appended one at a time.
+        """
+        for event in events:
+            if isinstance(event, CallThought):
+                await self.append_call_thought(call_id, event)
+            else:
+                await self.append_call_action(call_id, event)
+
     @abstractmethod
     async def register_call_done(self, call_id: UUID, result: CallResult) -> None:
         """Mark call as completed with result."""
@@ -62,8 +107,8 @@ class CallRepository(ABC):
         pass
 
     @abstractmethod
-    async def register_call_cancelled(self, call_id: UUID) -> None:
-        """Mark call as cancelled."""
+    async def register_call_cancelled(self, call_id: UUID) -> CallSummary | None:
+        """Mark call as cancelled and return the updated call, if it exists."""
         pass
 
     @abstractmethod
@@ -77,8 +122,14 @@ class CallRepository(ABC):
         pass
 
     @abstractmethod
-    async def subscribe_to_call(self, call_id: UUID) -> AsyncIterator[CallEvent]:
-        """Subscribe to real-time events for a call."""
+    async def subscribe_to_call(
+        self, call_id: UUID
+    ) -> AsyncIterator[CallEvent | WSError]:
+        """
+        Subscribe to real-time events for a call.
+
+        Yields a WSError before ending if the subscriber fell too far behind.
+        """
         pass
 
     @abstractmethod
@@ -98,7 +149,7 @@ class InMemoryCallRepository(CallRepository):
     def __init__(self):
         self._calls: dict[UUID, CallSummary] = {}
         self._events: dict[UUID, list[CallEvent]] = {}
-        self._subscribers: dict[UUID, list[asyncio.Queue]] = {}
+        self._subscribers: dict[UUID, set[asyncio.Queue]] = {}
 
     async def create_call(self, spec: CallSpec) -> CallSummary:
         call = CallSummary(
@@ -110,7 +161,7 @@ class InMemoryCallRepository(CallRepository):
         )
         self._calls[call.id] = call
         self._events[call.id] = []
-        self._subscribers[call.id] = []
+        self._subscribers[call.id] = set()
         return call
 
     async def get_call(self, call_id: UUID) -> CallSummary | None:
@@ -213,7 +264,7 @@ class InMemoryCallRepository(CallRepository):
             # Clean up subscribers for failed call
             await self._cleanup_subscribers(call_id)
 
-    async def register_call_cancelled(self, call_id: UUID) -> None:
+    async def register_call_cancelled(self, call_id: UUID) -> CallSummary | None:
         if call := self._calls.get(call_id):
             old_status = call.status
             call.status = CallStatus.CANCELLED
@@ -228,6 +279,8 @@ class InMemoryCallRepository(CallRepository):
             # Clean up subscribers for cancelled call
             await self._cleanup_subscribers(call_id)
 
+        return call
+
     async def list_calls(self, request: CallListRequest) -> CallListResponse:
         calls = list(self._calls.values())
 
@@ -260,19 +313,22 @@ class InMemoryCallRepository(CallRepository):
 
         events = self._events.get(call_id, [])
         logger.info(f"get_call_events for {call_id}: returning {len(events)} events")
-        for i, event in enumerate(events):
-            event_type = (
-                event.event_type
-                if hasattr(event, "event_type")
-                else type(event).__name__
-            )
-            logger.debug(
-                f"  Event {i + 1}: {event_type}, iteration={getattr(event, 'iteration', 'N/A')}"
-            )
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, event in enumerate(events):
+                event_type = (
+                    event.event_type
+                    if hasattr(event, "event_type")
+                    else type(event).__name__
+                )
+                logger.debug(
+                    f"  Event {i + 1}: {event_type}, iteration={getattr(event, 'iteration', 'N/A')}"
+                )
         # Sort by timestamp, then by iteration for events with same timestamp
         return sorted(events, key=lambda e: (e.timestamp, getattr(e, "iteration", 0)))
 
-    async def subscribe_to_call(self, call_id: UUID) -> AsyncIterator[CallEvent]:
+    async def subscribe_to_call(
+        self, call_id: UUID
+    ) -> AsyncIterator[CallEvent | WSError]:
         from ..utils import log
         from ..models.calls import CallStatusChange
 
@@ -316,8 +372,8 @@ class InMemoryCallRepository(CallRepository):
         )
 
         # Otherwise, subscribe to future events
-        queue = asyncio.Queue()
-        self._subscribers[call_id].append(queue)
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[call_id].add(queue)
         logger.debug(
             f"Created queue for call {call_id}, now {len(self._subscribers[call_id])} subscribers"
         )
@@ -357,8 +413,8 @@ class InMemoryCallRepository(CallRepository):
                         break
         finally:
             # Clean up subscription
-            if queue in self._subscribers.get(call_id, []):
-                self._subscribers[call_id].remove(queue)
+            if subscribers := self._subscribers.get(call_id):
+                subscribers.discard(queue)
 
     async def call_exists(self, call_id: UUID) -> bool:
         return call_id in self._calls
@@ -374,7 +430,7 @@ class InMemoryCallRepository(CallRepository):
 
         logger = log.get_logger(__name__)
 
-        subscribers = self._subscribers.get(call_id, [])
+        subscribers = self._subscribers.get(call_id, ())
         event_type = (
             event.event_type if hasattr(event, "event_type") else type(event).__name__
         )
@@ -382,18 +438,19 @@ class InMemoryCallRepository(CallRepository):
             f"Notifying {len(subscribers)} subscribers of {event_type} event for call {call_id}"
         )
 
-        for i, queue in enumerate(subscribers):
+        for i, queue in enumerate(tuple(subscribers)):
             try:
                 queue.put_nowait(event)
                 logger.debug(
                     f"Successfully notified subscriber {i + 1}/{len(subscribers)}"
                 )
             except asyncio.QueueFull:
-                # Skip slow subscribers
+                # Disconnect slow subscribers instead of buffering without bound
                 logger.warning(
-                    f"Subscriber {i + 1}/{len(subscribers)} queue is full, skipping"
+                    f"Subscriber {i + 1} queue for call {call_id} is full, disconnecting"
                 )
-                pass
+                subscribers.discard(queue)
+                close_subscriber_queue(queue, call_id)
 
     async def _emit_status_change(
         self, call_id: UUID, old_status: CallStatus, new_status: CallStatus
@@ -408,12 +465,9 @@ class InMemoryCallRepository(CallRepository):
 
     async def _cleanup_subscribers(self, call_id: UUID) -> None:
         """Clean up subscribers for a finished call."""
-        for queue in self._subscribers.get(call_id, []):
-            try:
-                # Send a sentinel to indicate stream end
-                queue.put_nowait(None)
-            except asyncio.QueueFull:
-                pass
+        for queue in self._subscribers.get(call_id, ()):
+            # Send a sentinel to indicate stream end
+            close_subscriber_queue(queue, call_id)
 
-        # Clear subscribers list
-        self._subscribers[call_id] = []
+        # Clear subscribers
+        self._subscribers[call_id] = set()
@@ -22,10 +22,15 @@ from ..models.calls import (
     CallListRequest,
     CallListResponse,
     CallStatusChange,
+    WSError,
 )
 from ..db.models import CallTable, CallEventTable
 from ..clients.postgres import PostgresClient
-from .calls import CallRepository
+from .calls import (
+    CallRepository,
+    SUBSCRIBER_QUEUE_SIZE,
+    close_subscriber_queue,
+)
 
 
 class PostgresCallRepository(CallRepository):
@@ -33,7 +38,7 @@ class PostgresCallRepository(CallRepository):
 
     def __init__(self, postgres_client: PostgresClient):
         self.postgres_client = postgres_client
-        self._subscribers: dict[UUID, list[asyncio.Queue]] = {}
+        self._subscribers: dict[UUID, set[asyncio.Queue]] = {}
 
     async def create_call(self, spec: CallSpec) -> CallSummary:
         call = CallSummary(
@@ -56,7 +61,7 @@ class PostgresCallRepository(CallRepository):
             await session.commit()
 
         # Initialize subscribers for this call
-        self._subscribers[call.id] = []
+        self._subscribers[call.id] = set()
         return call
 
     async def get_call(self, call_id: UUID) -> CallSummary | None:
@@ -68,19 +73,7 @@ class PostgresCallRepository(CallRepository):
             if not call_row:
                 return None
 
-            return CallSummary(
-                id=UUID(call_row.id),
-                agent_name=call_row.agent_name,
-                input_data=call_row.input_data,
-                status=CallStatus(call_row.status),
-                created_at=call_row.created_at,
-                started_at=call_row.started_at,
-                completed_at=call_row.completed_at,
-                metadata=call_row.call_metadata,
-                total_thoughts=call_row.total_thoughts,
-                total_actions=call_row.total_actions,
-                execution_time_ms=call_row.execution_time_ms,
-            )
+            return self._to_call_summary(call_row)
 
     async def register_call_started(self, call_id: UUID) -> None:
         async with self.postgres_client.get_session() as session:
@@ -114,7 +107,7 @@ class PostgresCallRepository(CallRepository):
                 event_type="thought",
                 timestamp=thought.timestamp,
                 sequence=thought.sequence,
-                data=thought.model_dump(),
+                data=thought.model_dump(mode="json"),
             )
             session.add(event_row)
 
@@ -146,7 +139,7 @@ class PostgresCallRepository(CallRepository):
                 event_type="action",
                 timestamp=action.timestamp,
                 sequence=action.sequence,
-                data=action.model_dump(),
+                data=action.model_dump(mode="json"),
             )
             session.add(event_row)
 
@@ -161,6 +154,53 @@ class PostgresCallRepository(CallRepository):
 
         await self._notify_subscribers(call_id, action)
 
+    async def append_call_events(
+        self, call_id: UUID, events: list[CallThought | CallAction]
+    ) -> None:
+        async with self.postgres_client.get_session() as session:
+            # Get current thought and action counts for sequence numbers
+            count_stmt = (
+                select(CallEventTable.event_type, func.count(CallEventTable.id))
+                .where(
+                    CallEventTable.call_id == str(call_id),
+                    CallEventTable.event_type.in_(("thought", "action")),
+                )
+                .group_by(CallEventTable.event_type)
+            )
+            result = await session.execute(count_stmt)
+            counts = {"thought": 0, "action": 0, **dict(result.all())}
+            added = {"thought": 0, "action": 0}
+
+            # Insert events
+            for event in events:
+                event_type = "thought" if isinstance(event, CallThought) else "action"
+                event.sequence = counts[event_type] + added[event_type]
+                added[event_type] += 1
+                event_row = CallEventTable(
+                    id=str(event.id),
+                    call_id=str(call_id),
+                    event_type=event_type,
+                    timestamp=event.timestamp,
+                    sequence=event.sequence,
+                    data=event.model_dump(mode="json"),
+                )
+                session.add(event_row)
+
+            # Update call stats
+            update_stmt = (
+                update(CallTable)
+                .where(CallTable.id == str(call_id))
+                .values(
+                    total_thoughts=CallTable.total_thoughts + added["thought"],
+                    total_actions=CallTable.total_actions + added["action"],
+                )
+            )
+            await session.execute(update_stmt)
+            await session.commit()
+
+        for event in events:
+            await self._notify_subscribers(call_id, event)
+
     async def register_call_done(self, call_id: UUID, result: CallResult) -> None:
         completed_at = datetime.now(timezone.utc)
 
@@ -195,7 +235,7 @@ class PostgresCallRepository(CallRepository):
                 event_type="result",
                 timestamp=result.timestamp,
                 sequence=0,  # Results don't need sequence
-                data=result.model_dump(),
+                data=result.model_dump(mode="json"),
             )
             session.add(event_row)
             await session.commit()
@@ -240,7 +280,7 @@ class PostgresCallRepository(CallRepository):
                 event_type="error",
                 timestamp=error.timestamp,
                 sequence=0,  # Errors don't need sequence
-                data=error.model_dump(),
+                data=error.model_dump(mode="json"),
             )
             session.add(event_row)
             await session.commit()
@@ -249,7 +289,7 @@ class PostgresCallRepository(CallRepository):
         await self._emit_status_change(call_id, CallStatus.RUNNING, CallStatus.FAILED)
         await self._cleanup_subscribers(call_id)
 
-    async def register_call_cancelled(self, call_id: UUID) -> None:
+    async def register_call_cancelled(self, call_id: UUID) -> CallSummary | None:
         completed_at = datetime.now(timezone.utc)
 
         async with self.postgres_client.get_session() as session:
@@ -259,7 +299,7 @@ class PostgresCallRepository(CallRepository):
             call_row = call_result.scalar_one_or_none()
 
             if not call_row:
-                return
+                return None
 
             old_status = CallStatus(call_row.status)
             execution_time_ms = None
@@ -268,6 +308,15 @@ class PostgresCallRepository(CallRepository):
                     (completed_at - call_row.started_at).total_seconds() * 1000
                 )
 
+            # Build the updated call now; the row expires on commit
+            call = self._to_call_summary(call_row).model_copy(
+                update={
+                    "status": CallStatus.CANCELLED,
+                    "completed_at": completed_at,
+                    "execution_time_ms": execution_time_ms,
+                }
+            )
+
             # Update call
             update_stmt = (
                 update(CallTable)
@@ -284,6 +333,8 @@ class PostgresCallRepository(CallRepository):
         await self._emit_status_change(call_id, old_status, CallStatus.CANCELLED)
         await self._cleanup_subscribers(call_id)
 
+        return call
+
     async def list_calls(self, request: CallListRequest) -> CallListResponse:
         async with self.postgres_client.get_session() as session:
             # Build query with filters
@@ -306,22 +357,7 @@ class PostgresCallRepository(CallRepository):
             result = await session.execute(stmt)
             call_rows = result.scalars().all()
 
-            calls = [
-                CallSummary(
-                    id=UUID(row.id),
-                    agent_name=row.agent_name,
-                    input_data=row.input_data,
-                    status=CallStatus(row.status),
-                    created_at=row.created_at,
-                    started_at=row.started_at,
-                    completed_at=row.completed_at,
-                    metadata=row.call_metadata,
-                    total_thoughts=row.total_thoughts,
-                    total_actions=row.total_actions,
-                    execution_time_ms=row.execution_time_ms,
-                )
-                for row in call_rows
-            ]
+            calls = [self._to_call_summary(row) for row in call_rows]
 
             return CallListResponse(
                 calls=calls, total=total, offset=request.offset, limit=request.limit
@@ -356,7 +392,9 @@ class PostgresCallRepository(CallRepository):
                 events, key=lambda e: (e.timestamp, getattr(e, "iteration", 0))
             )
 
-    async def subscribe_to_call(self, call_id: UUID) -> AsyncIterator[CallEvent]:
+    async def subscribe_to_call(
+        self, call_id: UUID
+    ) -> AsyncIterator[CallEvent | WSError]:
         # First, yield all historical events from the database
         historical_events = await self.get_call_events(call_id)
         for event in historical_events:
@@ -372,11 +410,8 @@ class PostgresCallRepository(CallRepository):
             return
 
         # Otherwise, subscribe to future events
-        if call_id not in self._subscribers:
-            self._subscribers[call_id] = []
-
-        queue = asyncio.Queue()
-        self._subscribers[call_id].append(queue)
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(call_id, set()).add(queue)
 
         try:
             while True:
@@ -395,8 +430,8 @@ class PostgresCallRepository(CallRepository):
                     break
         finally:
             # Clean up subscription
-            if call_id in self._subscribers and queue in self._subscribers[call_id]:
-                self._subscribers[call_id].remove(queue)
+            if subscribers := self._subscribers.get(call_id):
+                subscribers.discard(queue)
 
     async def call_exists(self, call_id: UUID) -> bool:
         async with self.postgres_client.get_session() as session:
@@ -416,14 +451,33 @@ class PostgresCallRepository(CallRepository):
 
             return CallStatus(status) in (CallStatus.PENDING, CallStatus.RUNNING)
 
+    @staticmethod
+    def _to_call_summary(row: CallTable) -> CallSummary:
+        """Convert a call row to a CallSummary."""
+        return CallSummary(
+            id=UUID(row.id),
+            agent_name=row.agent_name,
+            input_data=row.input_data,
+            status=CallStatus(row.status),
+            created_at=row.created_at,
+            started_at=row.started_at,
+            completed_at=row.completed_at,
+            metadata=row.call_metadata,
+            total_thoughts=row.total_thoughts,
+            total_actions=row.total_actions,
+            execution_time_ms=row.execution_time_ms,
+        )
+
     async def _notify_subscribers(self, call_id: UUID, event: CallEvent) -> None:
         """Notify all subscribers of a new event."""
-        for queue in self._subscribers.get(call_id, []):
+        subscribers = self._subscribers.get(call_id, set())
+        for queue in tuple(subscribers):
             try:
                 queue.put_nowait(event)
             except asyncio.QueueFull:
-                # Skip slow subscribers
-                pass
+                # Disconnect slow subscribers instead of buffering without bound
+                subscribers.discard(queue)
+                close_subscriber_queue(queue, call_id)
 
     async def _emit_status_change(
         self, call_id: UUID, old_status: CallStatus, new_status: CallStatus
@@ -441,7 +495,7 @@ class PostgresCallRepository(CallRepository):
                 event_type="status_change",
                 timestamp=status_change.timestamp,
                 sequence=0,  # Status changes don't need sequence
-                data=status_change.model_dump(),
+                data=status_change.model_dump(mode="json"),
             )
             session.add(event_row)
             await session.commit()
@@ -450,13 +504,10 @@ class PostgresCallRepository(CallRepository):
 
     async def _cleanup_subscribers(self, call_id: UUID) -> None:
         """Clean up subscribers for a finished call."""
-        for queue in self._subscribers.get(call_id, []):
-            try:
-                # Send a sentinel to indicate stream end
-                queue.put_nowait(None)
-            except asyncio.QueueFull:
-                pass
+        for queue in self._subscribers.get(call_id, ()):
+            # Send a sentinel to indicate stream end
+            close_subscriber_queue(queue, call_id)
 
-        # Clear subscribers list
+        # Clear subscribers
         if call_id in self._subscribers:
             del self._subscribers[call_id]
@@ -8,7 +8,6 @@ This module handles all agent-related endpoints including:
 """
 
 from fastapi import APIRouter, HTTPException, Request
-from ..utils.agent_utils import get_agent_schema
 
 router = APIRouter(tags=["agents"])
 
@@ -38,17 +37,8 @@ async def get_agent_info(agent_name: str, request: Request):
     Raises:
         HTTPException: If agent not found
     """
-    agent = request.app.state.agent_registry.get_agent(agent_name)
-    if not agent:
+    agent_info = request.app.state.agent_registry.get_agent_info(agent_name)
+    if not agent_info:
         raise HTTPException(status_code=404, detail=f"Agent '{agent_name}' not found")
 
-    schema_info = get_agent_schema(agent)
-    return {
-        "name": agent.name,
-        "description": agent.description,
-        "max_iterations": agent.max_iterations,
-        "verbose": agent.verbose,
-        "tools": [tool.name for tool in agent.tools] if hasattr(agent, "tools") else [],
-        "input_schema": schema_info["input_schema"],
-        "output_schema": schema_info["output_schema"],
-    }
+    return agent_info
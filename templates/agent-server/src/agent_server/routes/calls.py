@@ -135,11 +135,10 @@ async def cancel_call(call_id: UUID, request: Request):
     # Cancel the running task if it exists
     cancelled = await request.app.state.agent_registry.cancel_agent_execution(call_id)
 
-    # Update call status in repository
-    await request.app.state.call_repository.register_call_cancelled(call_id)
-
-    # Return updated call info
-    updated_call = await request.app.state.call_repository.get_call(call_id)
+    # Update call status in repository and return updated call info
+    updated_call = await request.app.state.call_repository.register_call_cancelled(
+        call_id
+    )
 
     # Add cancellation info to response
     if updated_call:
@@ -100,6 +100,13 @@ async def stream_call_events(websocket: WebSocket, call_id: UUID):
                     f"Received stream end sentinel for call {call_id} after {event_count} events"
                 )
                 break
+            if isinstance(event, WSError):  # Stream cut short, e.g. overflow
+                logger.warning(
+                    f"Ending stream for call {call_id} early: {event.error_type}"
+                )
+                message = WSMessage(type="error", data=event)
+                await websocket.send_text(message.model_dump_json())
+                break
 
             event_count += 1
             event_type = (
@@ -35,7 +35,8 @@ class AgentTestClient:
         else:
             self.base_url = base_url.rstrip("/")
         self.server_process = None
-        self.client = httpx.Client(timeout=120.0)  # 2 minute timeout
+        # 2 minute timeout
+        self.client = httpx.Client(base_url=self.base_url, timeout=120.0)
 
         if spawn_server:
             self._start_server()
@@ -106,13 +107,13 @@ class AgentTestClient:
                 raise RuntimeError(f"Server failed to start:\n{error_msg}")
 
             try:
-                response = self.client.get(f"{self.base_url}/api/v1/agents")
+                response = self.client.get("/api/v1/agents")
                 if response.status_code == 200:
                     console.print("[green]✓ Server ready[/green]")
                     startup_complete.set()
                     break
             except Exception as e:
-                current_time = time.time()
+                current_time = time.perf_counter()
                 # Log error every 3 seconds
                 if last_error != str(e) or current_time - last_error_time >= 3:
                     console.print(f"[dim]Waiting for server: {e}[/dim]")
@@ -149,7 +150,7 @@ class AgentTestClient:
 
     def list_agents(self) -> list[dict]:
         """List all available agents."""
-        response = self.client.get(f"{self.base_url}/api/v1/agents")
+        response = self.client.get("/api/v1/agents")
         response.raise_for_status()
         return response.json()
 
@@ -190,10 +191,10 @@ class AgentTestClient:
 
         # Make the call
         console.print("[yellow]⏳ Executing...[/yellow]")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         response = self.client.post(
-            f"{self.base_url}/api/v1/agents/{agent_name}/calls", json=call_spec
+            f"/api/v1/agents/{agent_name}/calls", json=call_spec
         )
         response.raise_for_status()
         call_data = response.json()
@@ -207,7 +208,7 @@ class AgentTestClient:
 
         # Poll for completion with timeout
         result = self._wait_for_completion(call_id, timeout=timeout)
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
 
         # Display result
         self._display_result(result, elapsed)
@@ -276,11 +277,11 @@ class AgentTestClient:
         Returns:
             Call result (may be incomplete if timed out)
         """
-        start = time.time()
+        start = time.perf_counter()
         last_call = None
 
-        while time.time() - start < timeout:
-            response = self.client.get(f"{self.base_url}/api/v1/calls/{call_id}")
+        while time.perf_counter() - start < timeout:
+            response = self.client.get(f"/api/v1/calls/{call_id}")
             response.raise_for_status()
             call = response.json()
             last_call = call
@@ -295,7 +296,7 @@ class AgentTestClient:
             f"[yellow]⚠️  Call timeout after {timeout:.1f} seconds, cancelling...[/yellow]"
         )
         try:
-            self.client.post(f"{self.base_url}/api/v1/calls/{call_id}/cancel")
+            self.client.post(f"/api/v1/calls/{call_id}/cancel")
         except Exception:
             pass  # Best effort cancellation
 
@@ -3,11 +3,38 @@ Utility functions for agent management and operations.
 """
 
 import asyncio
-from typing import Any
+from functools import lru_cache
+from typing import Any, Collection, Coroutine
+from pydantic import BaseModel, Field, create_model
 from ..utils import log
 
 logger = log.get_logger(__name__)
 
+# Background tasks running agent work, see spawn_agent_task()
+_AGENT_TASKS: set[asyncio.Task] = set()
+
+# Default input model for agents without schema
+DefaultAgentInput = create_model(
+    "DefaultAgentInput",
+    goal=(str, Field(description="What you want the agent to accomplish")),
+)
+
+# Default output is just a string - create a simple model
+DefaultAgentOutput = create_model(
+    "DefaultAgentOutput",
+    result=(str, Field(description="The agent's response")),
+)
+
+
+@lru_cache(maxsize=256)
+def _json_schema_for(model: type[BaseModel]) -> dict[str, Any]:
+    """
+    Get the JSON schema of a Pydantic model, generating it once per model.
+
+    The returned dict is shared between callers and must not be modified.
+    """
+    return model.model_json_schema()
+
 
 def get_agent_schema(agent: Any) -> dict[str, Any]:
     """
@@ -19,152 +46,128 @@ def get_agent_schema(agent: Any) -> dict[str, Any]:
     Returns:
         Dictionary containing input_schema, output_schema (as Pydantic models or None)
     """
-    from pydantic import BaseModel, Field, create_model
-
-    input_model = getattr(agent, "input_schema", None)
-    output_model = getattr(agent, "output_schema", None)
-    if not input_model:
-        # Default input model for agents without schema
-        input_model = create_model(
-            "DefaultAgentInput",
-            goal=(str, Field(description="What you want the agent to accomplish")),
-        )
-
-    if not output_model:
-        # Default output is just a string - create a simple model
-        output_model = create_model(
-            "DefaultAgentOutput",
-            result=(str, Field(description="The agent's response")),
-        )
+    input_model = getattr(agent, "input_schema", None) or DefaultAgentInput
+    output_model = getattr(agent, "output_schema", None) or DefaultAgentOutput
 
     return {
         "input_model": input_model,
         "output_model": output_model,
-        "input_schema": input_model.model_json_schema() if input_model else None,
-        "output_schema": output_model.model_json_schema() if output_model else None,
+        "input_schema": _json_schema_for(input_model),
+        "output_schema": _json_schema_for(output_model),
     }
 
 
+def _task_desc(task: asyncio.Task) -> str:
+    """Describe a task as coroutine_name(task_name) for log messages."""
+    coro = task.get_coro()
+    return f"{getattr(coro, '__name__', None) or coro}({task.get_name()})"
+
+
+class _TaskDescriptions:
+    """
+    Lazily formatted list of task descriptions for log messages.
+
+    The descriptions are only built if the log record is actually emitted.
+    """
+
+    def __init__(self, tasks: Collection[asyncio.Task]):
+        self.tasks = tasks
+
+    def __str__(self) -> str:
+        task_info = []
+        for task in self.tasks:
+            try:
+                task_info.append(_task_desc(task))
+            except (AttributeError, RuntimeError, TypeError):
+                task_info.append(f"task-{id(task)}")
+        return str(task_info)
+
+
+def spawn_agent_task(
+    coro: Coroutine[Any, Any, Any], *, name: str | None = None
+) -> asyncio.Task:
+    """
+    Start a background task for agent work and track it for shutdown.
+
+    Tracked tasks are the ones cancelled by cleanup_all_background_tasks().
+
+    Args:
+        coro: Coroutine to run
+        name: Optional task name, shown when the task is cleaned up
+
+    Returns:
+        The started task
+    """
+    task = asyncio.create_task(coro, name=name)
+    _AGENT_TASKS.add(task)
+    task.add_done_callback(_AGENT_TASKS.discard)
+    return task
+
+
 async def cleanup_all_background_tasks(grace_period: float = 3.0) -> None:
     """
     Clean up all background tasks with graceful shutdown and force kill.
 
+    Only tasks started with spawn_agent_task() are cleaned up.
+
     Args:
         grace_period: Time in seconds to wait for graceful shutdown
     """
-    # Get all currently running tasks except the current one and server-related tasks
-    current_task = asyncio.current_task()
-    all_tasks = []
-
-    for task in asyncio.all_tasks():
-        if task == current_task:
-            continue
-
-        # Try to identify server-related tasks to skip them
-        try:
-            coro_name = (
-                task.get_coro().__name__ if hasattr(task.get_coro(), "__name__") else ""
-            )
-
-            # Skip FastAPI/Uvicorn server tasks
-            if any(
-                skip in coro_name.lower()
-                for skip in ["serve", "_serve", "shutdown", "lifespan"]
-            ):
-                logger.debug(f"Skipping server task: {coro_name}")
-                continue
-            if "uvicorn" in str(task).lower() or "fastapi" in str(task).lower():
-                logger.debug(f"Skipping framework task: {task}")
-                continue
-        except Exception:
-            pass
-
-        all_tasks.append(task)
+    all_tasks = list(_AGENT_TASKS)
 
     if not all_tasks:
         logger.info("No agent background tasks to clean up")
         return
 
     # Log information about tasks we're going to clean up
-    task_info = []
-    for task in all_tasks:
-        try:
-            coro_name = (
-                task.get_coro().__name__
-                if hasattr(task.get_coro(), "__name__")
-                else str(task.get_coro())
-            )
-            task_info.append(
-                f"{coro_name}({task.get_name() if hasattr(task, 'get_name') else 'unnamed'})"
-            )
-        except:
-            task_info.append(f"task-{id(task)}")
-
-    logger.info(f"Cleaning up {len(all_tasks)} agent background tasks: {task_info}")
-    logger.info(f"Waiting {grace_period}s for graceful shutdown...")
-
-    # Phase 1: Graceful shutdown - cancel all tasks
+    logger.info(
+        "Cleaning up %d agent background tasks: %s",
+        len(all_tasks),
+        _TaskDescriptions(all_tasks),
+    )
+    logger.info("Waiting %ss for graceful shutdown...", grace_period)
+
+    # Phase 1: Graceful shutdown - cancel all tasks (a no-op for done ones)
     for task in all_tasks:
-        if not task.done():
-            task.cancel()
+        task.cancel()
 
     # Phase 2: Wait for graceful completion
-    try:
-        await asyncio.wait_for(
-            asyncio.gather(*all_tasks, return_exceptions=True), timeout=grace_period
-        )
+    _, remaining = await asyncio.wait(all_tasks, timeout=grace_period)
+    if not remaining:
         logger.info("All background tasks completed gracefully")
-    except asyncio.TimeoutError:
-        # Phase 3: Force kill any remaining tasks
-        remaining = [task for task in all_tasks if not task.done()]
-
-        if remaining:
-            remaining_info = []
-            for task in remaining:
-                try:
-                    coro_name = (
-                        task.get_coro().__name__
-                        if hasattr(task.get_coro(), "__name__")
-                        else str(task.get_coro())
-                    )
-                    remaining_info.append(
-                        f"{coro_name}({task.get_name() if hasattr(task, 'get_name') else 'unnamed'})"
-                    )
-                except Exception:
-                    remaining_info.append(f"task-{id(task)}")
-
-            logger.warning(f"Killing {len(remaining)} stubborn tasks: {remaining_info}")
-
-            for task in remaining:
-                task.cancel()
-
-            # Wait a bit more for force cancellation
-            try:
-                await asyncio.wait_for(
-                    asyncio.gather(*remaining, return_exceptions=True), timeout=1.0
-                )
-                logger.info("Force cancellation completed")
-            except asyncio.TimeoutError:
-                # Check what's still alive
-                still_alive = [task for task in remaining if not task.done()]
-                if still_alive:
-                    alive_info = []
-                    for task in still_alive:
-                        try:
-                            coro_name = (
-                                task.get_coro().__name__
-                                if hasattr(task.get_coro(), "__name__")
-                                else str(task.get_coro())
-                            )
-                            alive_info.append(
-                                f"{coro_name}({task.get_name() if hasattr(task, 'get_name') else 'unnamed'})"
-                            )
-                        except Exception:
-                            alive_info.append(f"task-{id(task)}")
-
-                    logger.error(
-                        f"The following {len(still_alive)} tasks refused to die: {alive_info}"
-                    )
-                    logger.error(
-                        "Proceeding with shutdown anyway - some tasks may be stuck in network I/O"
-                    )
+        return
+
+    # Phase 3: Force kill any remaining tasks
+    logger.warning(
+        "Killing %d stubborn tasks: %s",
+        len(remaining),
+        _TaskDescriptions(remaining),
+    )
+
+    for task in remaining:
+        task.cancel()
+
+    # Wait a bit more for force cancellation
+    _, still_alive = await asyncio.wait(remaining, timeout=1.0)
+    if not still_alive:
+        logger.info("Force cancellation completed")
+        return
+
+    # Check what's still alive
+    logger.error(
+        "The following %d tasks refused to die: %s",
+        len(still_alive),
+        _TaskDescriptions(still_alive),
+    )
+    logger.error(
+        "Proceeding with shutdown anyway - some tasks may be stuck in network I/O"
+    )
+
+
+__all__ = [
+    "DefaultAgentInput",
+    "DefaultAgentOutput",
+    "get_agent_schema",
+    "spawn_agent_task",
+    "cleanup_all_background_tasks",
+]
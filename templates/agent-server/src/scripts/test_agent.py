@@ -169,7 +169,8 @@ async def monitor_call_via_websocket(
     return final_status, final_result, final_error
 
 
-def main():
+def main() -> int:
+    """Run the agent test and return the process exit code."""
     parser = argparse.ArgumentParser(description="Test an agent")
     parser.add_argument("agent", help="Agent name")
     parser.add_argument("input", help="Input JSON")
@@ -200,7 +201,7 @@ def main():
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON input: {e}")
         logger.error("TEST FAILED: Invalid input JSON")
-        sys.exit(1)
+        return 1
 
     # Determine mode
     if args.api:
@@ -227,13 +228,12 @@ def main():
         logger.info(call_msg)
     import httpx
 
-    start_time = time.time()
+    start_time = time.perf_counter()
 
+    server_proc = None
     try:
-        server_proc = None
         if not args.api:
             import subprocess
-            import atexit
 
             env = os.environ.copy()
             env["USE_POSTGRES"] = "false"
@@ -243,44 +243,41 @@ def main():
                 ["./bin/uv-run", "app"], env=env, stdout=sys.stderr, stderr=sys.stderr
             )
 
-            def cleanup():
-                if server_proc and server_proc.poll() is None:
-                    server_proc.terminate()
+        # One client for the readiness checks and the call, so they share a
+        # kept-alive connection
+        with httpx.Client(base_url=base_url) as client:
+            if server_proc:
+                for i in range(50):  # 5 seconds max
                     try:
-                        server_proc.wait(timeout=2)
-                    except subprocess.TimeoutExpired:
-                        server_proc.kill()
-
-            atexit.register(cleanup)
+                        response = client.get("/api/v1/agents")
+                        if response.status_code == 200:
+                            logger.debug("Server ready")
+                            break
+                    except Exception:
+                        pass
+                    time.sleep(0.1)
+                else:
+                    logger.error(
+                        f"Server failed to start at {base_url} after 5 seconds"
+                    )
+                    logger.error("TEST FAILED: Server startup timeout")
+                    return 1
 
-            for i in range(50):  # 5 seconds max
-                try:
-                    response = httpx.get(f"{base_url}/api/v1/agents")
-                    if response.status_code == 200:
-                        logger.debug("Server ready")
-                        break
-                except Exception:
-                    pass
-                time.sleep(0.1)
-            else:
-                logger.error(f"Server failed to start at {base_url} after 5 seconds")
-                logger.error("TEST FAILED: Server startup timeout")
-                sys.exit(1)
-
-        with httpx.Client() as client:
             call_spec = {"input_data": input_data}
             if args.max_iterations:
                 call_spec["max_iterations"] = args.max_iterations
-            endpoint = f"{base_url}/api/v1/agents/{args.agent}/calls"
+            endpoint = f"/api/v1/agents/{args.agent}/calls"
             try:
                 response = client.post(endpoint, json=call_spec, timeout=5.0)
                 try:
                     response_body = response.json()
-                except:
+                except ValueError:
                     response_body = response.text
 
                 if response.status_code >= 400:
-                    logger.error(f"HTTP {response.status_code} from POST {endpoint}")
+                    logger.error(
+                        f"HTTP {response.status_code} from POST {base_url}{endpoint}"
+                    )
                     logger.error(f"Request body: {json.dumps(call_spec)}")
                     logger.error(
                         f"Response body: {json.dumps(response_body) if isinstance(response_body, dict) else response_body}"
@@ -293,30 +290,30 @@ def main():
                         )
 
                     logger.error(
-                        f"TEST FAILED: POST {endpoint} returned HTTP {response.status_code} - {detail}"
+                        f"TEST FAILED: POST {base_url}{endpoint} returned HTTP {response.status_code} - {detail}"
                     )
-                    sys.exit(1)
+                    return 1
 
                 result = response_body
 
             except httpx.TimeoutException:
-                logger.error(f"Request timeout calling POST {endpoint}")
+                logger.error(f"Request timeout calling POST {base_url}{endpoint}")
                 logger.error("TEST FAILED: HTTP request timeout")
-                sys.exit(1)
+                return 1
             except httpx.ConnectError as e:
-                logger.error(f"Connection error calling POST {endpoint}: {e}")
+                logger.error(f"Connection error calling POST {base_url}{endpoint}: {e}")
                 logger.error("TEST FAILED: Could not connect to server")
-                sys.exit(1)
+                return 1
             except Exception as e:
-                logger.error(f"Unexpected error calling POST {endpoint}: {e}")
+                logger.error(f"Unexpected error calling POST {base_url}{endpoint}: {e}")
                 logger.error(f"TEST FAILED: {type(e).__name__}: {e}")
-                sys.exit(1)
+                return 1
 
             call_id = result.get("id")
             if not call_id:
                 logger.error(f"No call ID in response: {result}")
                 logger.error("TEST FAILED: Invalid server response (no call ID)")
-                sys.exit(1)
+                return 1
 
             logger.debug(f"Call ID: {call_id}")
 
@@ -326,31 +323,40 @@ def main():
         )
 
         if final_status == "completed":
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             log_success(final_result, execution_time)
-            sys.exit(0)
+            return 0
         elif final_status == "failed" or final_error:
             error_msg = final_error or "Unknown error"
             logger.error(f"Agent failed: {error_msg}")
-            sys.exit(1)
+            return 1
         elif final_status == "cancelled":
             logger.error("Agent cancelled")
-            sys.exit(1)
+            return 1
         elif final_status == "timeout":
             logger.error(f"Timeout after {args.timeout}s")
-            sys.exit(2)
+            return 2
         else:
             logger.error(f"Unexpected status: {final_status}")
-            sys.exit(1)
+            return 1
 
     except KeyboardInterrupt:
         logger.info("")
         logger.error("Interrupted by user")
-        sys.exit(130)
+        return 130
     except Exception as e:
         logger.exception(f"Unexpected error: {type(e).__name__}: {e}")
-        sys.exit(1)
+        return 1
+    finally:
+        # Stop the local server before returning, so that main() can be run
+        # again in the same process
+        if server_proc and server_proc.poll() is None:
+            server_proc.terminate()
+            try:
+                server_proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                server_proc.kill()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())